@@ -11,7 +11,7 @@
 
 # --- end cisst license ---
 
-__all__ = ["arm", "ecm", "mtm", "psm", "suj", "console", "teleop_psm"]
+__all__ = ["arm", "ecm", "mtm", "psm", "suj", "console", "teleop_psm", "multi_arm"]
 
 # arm classes
 from .arm import arm
@@ -23,3 +23,4 @@ from .psm import psm
 from .suj import suj
 from .console import console
 from .teleop_psm import teleop_psm
+from .multi_arm import multi_arm
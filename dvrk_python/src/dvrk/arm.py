@@ -21,6 +21,12 @@ For arm specific features, import the class psm or mtm (e.g. `from
 dvrk.psm import psm`) and initialize your instance using `psm1 =
 psm('PSM1')`.
 
+The arm uses the ROS node of your program if you already called
+`rospy.init_node`.  Otherwise, the first arm created starts an
+anonymous node `arm_api` with the log level set to `WARN`, all other
+arms share it.  Call `rospy.init_node` yourself before creating the
+arms if you need a specific node name, log level or signal handling.
+
 .. _interpolate:
 
 Interpolation
@@ -45,6 +51,34 @@ It is important to note that when `interpolate` is set to `False`,
 sending a new goal that is far from the last desired position will
 likely trigger a `PID tracking error <https://en.wikipedia.org/wiki/PID_controller>`_.
 
+When streaming cartesian positions with `interpolate` set to `False`
+faster than the arm controller can use them, the private ROS parameter
+`~cmd_rate` (in Hz) can be set for your node.  Only the latest
+position is then sent at that rate, older ones are dropped.  Any
+other command (goal, joint, effort or wrench) drops the position not
+sent yet.  By default (`0`) every position is sent immediately.
+
+.. _subscribers:
+
+Subscribers
+===========
+
+The arm subscribes to the continuous streams published by the arm
+controller (positions, velocities, efforts, jacobians...) with a
+`queue_size` of `1`, only the latest message is used.  Within a
+process, rospy shares a single subscription per topic name:
+
+* the queue size is set by the last subscriber created with an
+  explicit `queue_size`, so creating an arm after your own
+  subscribers on the same topics silently reduces their queue size
+  to `1`.  If your program needs every message (e.g. to record data),
+  create your subscribers after the arm and pass an explicit
+  `queue_size` (subscribers using the default don't change it), or
+  use a separate process.
+* messages are decoded with the type of the first subscriber, so use
+  the message types published by the controller for your own
+  subscribers (not `rospy.AnyMsg`).
+
 .. _currentvdesired:
 
 Current vs Desired position
@@ -76,9 +110,10 @@ Arm API
 # sphinx-apidoc -F -A "Yijun Hu" -o doc src
 
 from __future__ import print_function
-import inspect
 import threading
+import collections
 import math
+import time
 
 import rospy
 import numpy
@@ -109,6 +144,61 @@ from sensor_msgs.msg import JointState, Joy
 #    def preprocess(source):
 #        return source
 
+# scalar types accepted for joint values and indices, including numpy
+# scalars (e.g. from numpy.argmax) whose size is platform dependent
+_JOINT_VALUE_TYPES = (float, int, numpy.floating, numpy.integer)
+_JOINT_INDEX_TYPES = (int, numpy.integer)
+
+
+def _is_joint_value(value):
+    """Check if a scalar can be used as a joint value.  `bool` is a
+    subclass of `int` but is rejected so `True` isn't used as 1.0.
+
+    :param value: the value to check
+    :rtype: Bool"""
+    return isinstance(value, _JOINT_VALUE_TYPES) and not isinstance(value, bool)
+
+
+def _is_joint_index(index):
+    """Check if a scalar can be used as a joint index.  `bool` is
+    rejected since numpy uses it as a mask, not as an index.
+
+    :param index: the index to check
+    :rtype: Bool"""
+    return isinstance(index, _JOINT_INDEX_TYPES) and not isinstance(index, bool)
+
+
+# longest timeout supported by threading, longer ones wait forever
+_TIMEOUT_MAX = getattr(threading, 'TIMEOUT_MAX', float('inf'))
+
+
+def _event_timeout(timeout):
+    """Convert a timeout in seconds to the value used by
+    `threading.Event.wait`.
+
+    :param timeout: the timeout, `None` or `float('inf')` to wait forever
+    :returns: the timeout in seconds, `None` to wait forever or `False` if not a positive number
+    :rtype: float"""
+    if timeout is None:
+        return None
+    if (not(_is_joint_value(timeout)) or not(timeout > 0)):
+        return False
+    if (timeout >= _TIMEOUT_MAX):
+        return None
+    return float(timeout)
+
+
+def _read_only_view(array):
+    """Create a view on an array that can't be used to modify it.
+
+    :param array: the array to view
+    :returns: read-only view sharing the array data
+    :rtype: `numpy.ndarray`"""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
 class arm(object):
     """Simple arm API wrapping around ROS messages
     """
@@ -129,30 +219,73 @@ class arm(object):
         self.__arm_name = arm_name
         self.__ros_namespace = ros_namespace
         self.__arm_current_state = ''
-        self.__arm_current_state_event = threading.Event()
+        self.__arm_current_state_cv = threading.Condition()
         self.__arm_desired_state = ''
         self.__goal_reached = False
         self.__goal_reached_event = threading.Event()
+        self.__goal_timeout = 20.0
 
         # continuous publish from dvrk_bridge
-        self.__position_joint_desired = numpy.array(0, dtype = numpy.float)
-        self.__effort_joint_desired = numpy.array(0, dtype = numpy.float)
+        # joint arrays are allocated when the first message is received
+        self.__joint_number = 0
+        self.__position_joint_desired = numpy.zeros(0, dtype = numpy.float64)
+        self.__effort_joint_desired = numpy.zeros(0, dtype = numpy.float64)
         self.__position_cartesian_desired = PyKDL.Frame()
         self.__position_cartesian_local_desired = PyKDL.Frame()
-        self.__position_joint_current = numpy.array(0, dtype = numpy.float)
-        self.__velocity_joint_current = numpy.array(0, dtype = numpy.float)
-        self.__effort_joint_current = numpy.array(0, dtype = numpy.float)
+        self.__position_joint_current = numpy.zeros(0, dtype = numpy.float64)
+        self.__velocity_joint_current = numpy.zeros(0, dtype = numpy.float64)
+        self.__effort_joint_current = numpy.zeros(0, dtype = numpy.float64)
         self.__position_cartesian_current = PyKDL.Frame()
         self.__position_cartesian_local_current = PyKDL.Frame()
-        self.__twist_body_current = numpy.zeros(6, dtype = numpy.float)
-        self.__wrench_body_current = numpy.zeros(6, dtype = numpy.float)
-        self.__jacobian_spatial = numpy.ndarray(0, dtype = numpy.float)
-        self.__jacobian_body = numpy.ndarray(0, dtype = numpy.float)
+        self.__twist_body_current = numpy.zeros(6, dtype = numpy.float64)
+        self.__wrench_body_current = numpy.zeros(6, dtype = numpy.float64)
+        self.__jacobian_spatial = numpy.ndarray(0, dtype = numpy.float64)
+        self.__jacobian_body = numpy.ndarray(0, dtype = numpy.float64)
+
+        # read-only views returned by getters, updated when arrays are allocated
+        self.__position_joint_desired_view = _read_only_view(self.__position_joint_desired)
+        self.__effort_joint_desired_view = _read_only_view(self.__effort_joint_desired)
+        self.__position_joint_current_view = _read_only_view(self.__position_joint_current)
+        self.__velocity_joint_current_view = _read_only_view(self.__velocity_joint_current)
+        self.__effort_joint_current_view = _read_only_view(self.__effort_joint_current)
+
+        # optional joint limits, checked before any joint command is sent
+        self.__joint_min = None
+        self.__joint_max = None
+
+        # buffer used to compute joint commands
+        self.__joint_cmd_buf = numpy.zeros(0, dtype = numpy.float64)
+
+        # messages re-used for commands, rospy serializes on publish
+        self.__pose_direct_msg = Pose()
+        self.__pose_goal_msg = Pose()
+        self.__joint_state_direct_msg = JointState()
+        self.__joint_state_goal_msg = JointState()
+        self.__effort_joint_msg = JointState()
+        # force only wrench, torque is never modified
+        self.__wrench_msg = Wrench()
+        self.__wrench_msg.torque.x = 0.0
+        self.__wrench_msg.torque.y = 0.0
+        self.__wrench_msg.torque.z = 0.0
+
+        # frames used for incremental translations and rotations
+        self.__delta_translation_frame = PyKDL.Frame(PyKDL.Rotation.Identity(),
+                                                     PyKDL.Vector(0.0, 0.0, 0.0))
+        self.__delta_rotation_frame = PyKDL.Frame(PyKDL.Rotation.Identity(),
+                                                  PyKDL.Vector(0.0, 0.0, 0.0))
+
+        # dispatch tables for cartesian moves based on input type
+        self.__dmove_dispatch = {PyKDL.Vector: self.__dmove_translation,
+                                 PyKDL.Rotation: self.__dmove_rotation,
+                                 PyKDL.Frame: self.__dmove_frame}
+        self.__move_dispatch = {PyKDL.Vector: self.__move_translation,
+                                PyKDL.Rotation: self.__move_rotation,
+                                PyKDL.Frame: self.__move_frame}
 
         self.__sub_list = []
         self.__pub_list = []
 
-        # publishers
+        # publishers, streaming commands are not latched
         frame = PyKDL.Frame()
         self.__full_ros_namespace = self.__ros_namespace + self.__arm_name
         self.__set_arm_desired_state_pub = rospy.Publisher(self.__full_ros_namespace
@@ -160,28 +293,28 @@ class arm(object):
                                                            String, latch = True, queue_size = 1)
         self.__set_position_joint_pub = rospy.Publisher(self.__full_ros_namespace
                                                         + '/set_position_joint',
-                                                        JointState, latch = True, queue_size = 1)
+                                                        JointState, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_position_goal_joint_pub = rospy.Publisher(self.__full_ros_namespace
                                                              + '/set_position_goal_joint',
                                                              JointState, latch = True, queue_size = 1)
         self.__set_position_cartesian_pub = rospy.Publisher(self.__full_ros_namespace
                                                             + '/set_position_cartesian',
-                                                            Pose, latch = True, queue_size = 1)
+                                                            Pose, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_position_goal_cartesian_pub = rospy.Publisher(self.__full_ros_namespace
                                                                  + '/set_position_goal_cartesian',
                                                                  Pose, latch = True, queue_size = 1)
         self.__set_effort_joint_pub = rospy.Publisher(self.__full_ros_namespace
                                                       + '/set_effort_joint',
-                                                      JointState, latch = True, queue_size = 1)
+                                                      JointState, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_wrench_body_pub = rospy.Publisher(self.__full_ros_namespace
                                                      + '/set_wrench_body',
-                                                     Wrench, latch = True, queue_size = 1)
+                                                     Wrench, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_wrench_body_orientation_absolute_pub = rospy.Publisher(self.__full_ros_namespace
                                                                           + '/set_wrench_body_orientation_absolute',
                                                                           Bool, latch = True, queue_size = 1)
         self.__set_wrench_spatial_pub = rospy.Publisher(self.__full_ros_namespace
                                                         + '/set_wrench_spatial',
-                                                        Wrench, latch = True, queue_size = 1)
+                                                        Wrench, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_gravity_compensation_pub = rospy.Publisher(self.__full_ros_namespace
                                                               + '/set_gravity_compensation',
                                                               Bool, latch = True, queue_size = 1)
@@ -195,47 +328,77 @@ class arm(object):
                            self.__set_wrench_body_orientation_absolute_pub,
                            self.__set_wrench_spatial_pub,
                            self.__set_gravity_compensation_pub]
-        # subscribers
+        # subscribers, continuous streams only keep the latest message
         self.__sub_list = [rospy.Subscriber(self.__full_ros_namespace + '/current_state',
-                                            String, self.__arm_current_state_cb),
+                                            String, self.__arm_current_state_cb,
+                                            tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/desired_state',
-                                          String, self.__arm_desired_state_cb),
+                                            String, self.__arm_desired_state_cb,
+                                            tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/goal_reached',
-                                          Bool, self.__goal_reached_cb),
+                                            Bool, self.__goal_reached_cb,
+                                            tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/state_joint_desired',
-                                          JointState, self.__state_joint_desired_cb),
+                                            JointState, self.__state_joint_desired_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/position_cartesian_desired',
-                                          PoseStamped, self.__position_cartesian_desired_cb),
+                                            PoseStamped, self.__position_cartesian_desired_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/position_cartesian_local_desired',
-                                          PoseStamped, self.__position_cartesian_local_desired_cb),
+                                            PoseStamped, self.__position_cartesian_local_desired_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/state_joint_current',
-                                          JointState, self.__state_joint_current_cb),
+                                            JointState, self.__state_joint_current_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/position_cartesian_current',
-                                          PoseStamped, self.__position_cartesian_current_cb),
+                                            PoseStamped, self.__position_cartesian_current_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/position_cartesian_local_current',
-                                          PoseStamped, self.__position_cartesian_local_current_cb),
+                                            PoseStamped, self.__position_cartesian_local_current_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/twist_body_current',
-                                          TwistStamped, self.__twist_body_current_cb),
+                                            TwistStamped, self.__twist_body_current_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/wrench_body_current',
-                                          WrenchStamped, self.__wrench_body_current_cb),
+                                            WrenchStamped, self.__wrench_body_current_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/jacobian_spatial',
-                                          Float64MultiArray, self.__jacobian_spatial_cb),
+                                            Float64MultiArray, self.__jacobian_spatial_cb,
+                                            queue_size = 1, tcp_nodelay = True),
                            rospy.Subscriber(self.__full_ros_namespace + '/jacobian_body',
-                                          Float64MultiArray, self.__jacobian_body_cb)]
+                                            Float64MultiArray, self.__jacobian_body_cb,
+                                            queue_size = 1, tcp_nodelay = True)]
 
         # create node
         if not rospy.get_node_uri():
             rospy.init_node('arm_api', anonymous = True, log_level = rospy.WARN)
         else:
-            rospy.logdebug(rospy.get_caller_id() + ' -> ROS already initialized')
+            rospy.logdebug('%s -> ROS already initialized', rospy.get_caller_id())
+        self.__caller_id = rospy.get_caller_id()
+
+        # optional rate limit for direct cartesian commands, only the
+        # latest command is sent at each period.  0 publishes immediately
+        self.__cmd_rate = rospy.get_param('~cmd_rate', 0.0)
+        self.__cartesian_direct_queue = collections.deque(maxlen = 1)
+        self.__cartesian_direct_event = threading.Event()
+        # held while the thread publishes the queued command
+        self.__cartesian_direct_lock = threading.Lock()
+        self.__cartesian_direct_stop = False
+        self.__cartesian_direct_thread = None
+        if (self.__cmd_rate > 0.0):
+            # commands are converted and published by a separate thread
+            self.__cartesian_direct_thread = threading.Thread(target = self.__cartesian_direct_loop)
+            self.__cartesian_direct_thread.daemon = True
+            self.__cartesian_direct_thread.start()
 
 
     def __arm_current_state_cb(self, data):
         """Callback for arm current state.
 
         :param data: the current arm state"""
-        self.__arm_current_state = data.data
-        self.__arm_current_state_event.set()
+        with self.__arm_current_state_cv:
+            self.__arm_current_state = data.data
+            self.__arm_current_state_cv.notify_all()
 
 
     def __arm_desired_state_cb(self, data):
@@ -257,10 +420,20 @@ class arm(object):
         """Callback for the joint desired position.
 
         :param data: the `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_desired"""
-        self.__position_joint_desired.resize(len(data.position))
-        self.__effort_joint_desired.resize(len(data.effort))
-        self.__position_joint_desired.flat[:] = data.position
-        self.__effort_joint_desired.flat[:] = data.effort
+        # only allocate if the number of joints changed
+        if self.__position_joint_desired.size != len(data.position):
+            position_joint_desired = numpy.zeros(len(data.position), dtype = numpy.float64)
+            numpy.copyto(position_joint_desired, data.position)
+            self.__position_joint_desired = position_joint_desired
+            self.__position_joint_desired_view = _read_only_view(position_joint_desired)
+            # update the number of joints last so other threads never
+            # see it larger than the desired position array
+            self.__joint_number = len(data.position)
+        if self.__effort_joint_desired.size != len(data.effort):
+            self.__effort_joint_desired = numpy.zeros(len(data.effort), dtype = numpy.float64)
+            self.__effort_joint_desired_view = _read_only_view(self.__effort_joint_desired)
+        numpy.copyto(self.__position_joint_desired, data.position)
+        numpy.copyto(self.__effort_joint_desired, data.effort)
 
 
     def __position_cartesian_desired_cb(self, data):
@@ -281,12 +454,19 @@ class arm(object):
         """Callback for the current joint position.
 
         :param data: the `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_current"""
-        self.__position_joint_current.resize(len(data.position))
-        self.__velocity_joint_current.resize(len(data.velocity))
-        self.__effort_joint_current.resize(len(data.effort))
-        self.__position_joint_current.flat[:] = data.position
-        self.__velocity_joint_current.flat[:] = data.velocity
-        self.__effort_joint_current.flat[:] = data.effort
+        # only allocate if the number of joints changed
+        if self.__position_joint_current.size != len(data.position):
+            self.__position_joint_current = numpy.zeros(len(data.position), dtype = numpy.float64)
+            self.__position_joint_current_view = _read_only_view(self.__position_joint_current)
+        if self.__velocity_joint_current.size != len(data.velocity):
+            self.__velocity_joint_current = numpy.zeros(len(data.velocity), dtype = numpy.float64)
+            self.__velocity_joint_current_view = _read_only_view(self.__velocity_joint_current)
+        if self.__effort_joint_current.size != len(data.effort):
+            self.__effort_joint_current = numpy.zeros(len(data.effort), dtype = numpy.float64)
+            self.__effort_joint_current_view = _read_only_view(self.__effort_joint_current)
+        numpy.copyto(self.__position_joint_current, data.position)
+        numpy.copyto(self.__velocity_joint_current, data.velocity)
+        numpy.copyto(self.__effort_joint_current, data.effort)
 
 
     def __position_cartesian_current_cb(self, data):
@@ -351,16 +531,33 @@ class arm(object):
         :rtype: Bool"""
         if (self.__arm_desired_state == state):
             return True
-        self.__arm_current_state_event.clear()
-        self.__set_arm_desired_state_pub.publish(state)
-        self.__arm_current_state_event.wait(timeout)
+        with self.__arm_current_state_cv:
+            self.__set_arm_desired_state_pub.publish(state)
+            reached = self.__wait_for_current_state(state, timeout)
         # if the state is not changed return False
-        if (self.__arm_current_state != state):
-            rospy.logfatal(rospy.get_caller_id() + ' -> failed to reach state ' + state)
+        if not reached:
+            rospy.logfatal('%s -> failed to reach state %s', self.__caller_id, state)
             return False
         return True
 
 
+    def __wait_for_current_state(self, state, timeout):
+        """Wait until the arm current state matches.  This must be
+        called with the current state condition acquired.
+
+        :param state: the expected arm state
+        :param timeout: the maximum amount of time to wait for, in seconds
+        :return: whether or not the arm reached the state
+        :rtype: Bool"""
+        deadline = time.time() + timeout
+        while (self.__arm_current_state != state):
+            remaining = deadline - time.time()
+            if (remaining <= 0.0):
+                return False
+            self.__arm_current_state_cv.wait(remaining)
+        return True
+
+
     def name(self):
         return self.__arm_name
 
@@ -371,18 +568,12 @@ class arm(object):
         # if we already received a state
         if (self.__arm_current_state == 'READY'):
             return
-        self.__arm_current_state_event.clear()
-        self.__set_arm_desired_state_pub.publish('READY')
-        counter = 10 # up to 10 transitions to get ready
-        while (counter > 0):
-            self.__arm_current_state_event.wait(20) # give up to 20 secs for each transition
-            if (self.__arm_current_state != 'READY'):
-                self.__arm_current_state_event.clear()
-                counter = counter - 1
-            else:
-                counter = -1
-        if (self.__arm_current_state != 'READY'):
-            rospy.logfatal(rospy.get_caller_id() + ' -> failed to reach state READY')
+        with self.__arm_current_state_cv:
+            self.__set_arm_desired_state_pub.publish('READY')
+            # give up to 200 secs to get ready, homing goes through multiple states
+            reached = self.__wait_for_current_state('READY', 200)
+        if not reached:
+            rospy.logfatal('%s -> failed to reach state READY', self.__caller_id)
 
 
     def shutdown(self):
@@ -448,7 +639,7 @@ class arm(object):
 
         :returns: the current position of the arm in joint space
         :rtype: `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_"""
-        return self.__position_joint_current
+        return self.__position_joint_current_view
 
 
     def get_current_joint_velocity(self):
@@ -457,7 +648,7 @@ class arm(object):
 
         :returns: the current position of the arm in joint space
         :rtype: `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_"""
-        return self.__velocity_joint_current
+        return self.__velocity_joint_current_view
 
 
     def get_current_joint_effort(self):
@@ -466,7 +657,7 @@ class arm(object):
 
         :returns: the current position of the arm in joint space
         :rtype: `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_"""
-        return self.__effort_joint_current
+        return self.__effort_joint_current_view
 
     def get_jacobian_spatial(self):
         """Get the :ref:`jacobian spatial` of the arm.
@@ -504,7 +695,7 @@ class arm(object):
 
         :returns: the desired position of the arm in joint space
         :rtype: `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_"""
-        return self.__position_joint_desired
+        return self.__position_joint_desired_view
 
 
     def get_desired_joint_effort(self):
@@ -513,7 +704,7 @@ class arm(object):
 
         :returns: the desired effort of the arm in joint space
         :rtype: `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_"""
-        return self.__effort_joint_desired
+        return self.__effort_joint_desired_view
 
 
     def get_joint_number(self):
@@ -521,50 +712,105 @@ class arm(object):
 
         :returns: the number of joints on the specified arm
         :rtype: int"""
-        joint_num = len(self.__position_joint_desired)
-        return joint_num
+        return self.__joint_number
+
+
+    def set_joint_limits(self, lower, upper):
+        """Set the joint limits checked before sending joint commands.
+        The dVRK console doesn't publish the joint limits so they
+        have to be provided by the user, e.g. from the arm
+        configuration files.  Use `None` for both limits to disable
+        the check.
+
+        :param lower: the lower limits, this is a numpy array or list of floats
+        :param upper: the upper limits, this is a numpy array or list of floats
+        :returns: whether or not the limits have been set
+        :rtype: Bool"""
+        if (lower is None and upper is None):
+            self.__joint_min = None
+            self.__joint_max = None
+            return True
+        if (lower is None or upper is None):
+            rospy.logerr('%s -> both joint limits must be set, or both None to disable', self.__caller_id)
+            return False
+        try:
+            lower = numpy.array(lower, dtype = numpy.float64).ravel()
+            upper = numpy.array(upper, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> joint limits must be arrays of floats', self.__caller_id)
+            return False
+        # also rejects NaN limits
+        if (not(lower.size == upper.size)
+            or not(numpy.all(lower <= upper))):
+            rospy.logerr('%s -> joint limits must have the same size and lower must be less than upper', self.__caller_id)
+            return False
+        self.__joint_min = lower
+        self.__joint_max = upper
+        return True
 
 
-    def __check_input_type(self, input, type_list):
-        """Check if the data input is a data type that is located in type_list
+    def check_joint_limits(self, abs_joint):
+        """Check that joint positions are within the joint limits set
+        with `set_joint_limits`.  Prints an error message with the
+        offending joints if they are not.
 
-        :param input: The data type that needs to be checked.
-        :param type_list : A list of types to check input against.
-        :returns: whether or not the input is a type in type_list
+        :param abs_joint: the joint positions, a numpy array (or list of floats) with one position per row if 2D
+        :returns: whether or not the positions are within limits, always `True` if no limits are set
         :rtype: Bool"""
-        found = False
-        # check the input against all input_type
-        for i in range (len(type_list)):
-            if (type(input) is type_list[i]):
-                  return True
-        # not of type_list print state for this error inside
-        if (found == False):
-            print('Error in ', inspect.stack()[1][3], 'input is of type', input, 'and is not one of:')
-            message = ''
-            # skip_length
-            i = 0
-            while i < len(type_list):
-                message += ' '
-                message += str(type_list[i])
-                i += 1
-            print(message)
+        if self.__joint_min is None:
+            return True
+        # no copy if already an array of floats
+        try:
+            abs_joint = numpy.asarray(abs_joint, dtype = numpy.float64)
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> joint positions must be an array of floats', self.__caller_id)
+            return False
+        if (not(abs_joint.ndim in (1, 2))
+            or not(abs_joint.shape[-1] == self.__joint_min.size)):
+            rospy.logerr('%s -> joint limits are set for %d joints', self.__caller_id, self.__joint_min.size)
+            return False
+        within = (abs_joint >= self.__joint_min) & (abs_joint <= self.__joint_max)
+        if within.all():
+            return True
+        if (within.ndim > 1):
+            within = within.all(axis = 0)
+        rospy.logerr('%s -> joints %s are outside of joint limits', self.__caller_id,
+                     numpy.flatnonzero(~within).tolist())
         return False
 
 
+    def __to_vector(self, values):
+        """Convert a sequence of 3 floats (list, tuple, numpy array...) to a vector.
+
+        :param values: the sequence to convert
+        :returns: the vector or None if the input can't be converted
+        :rtype: `PyKDL.Vector <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_"""
+        try:
+            values = numpy.asarray(values, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            return None
+        if (values.size != 3):
+            return None
+        return PyKDL.Vector(values[0], values[1], values[2])
+
+
     def dmove(self, delta_input, interpolate = True, blocking = True):
         """Incremental motion in cartesian space.
 
-        :param delta_input: the incremental motion you want to make
+        :param delta_input: the incremental motion you want to make, either a PyKDL Vector, Rotation, Frame or a sequence of 3 floats for a translation
         :param interpolate: see  :ref:`interpolate <interpolate>`
         """
-        # is this a legal translation input
-        if (self.__check_input_type(delta_input, [PyKDL.Vector, PyKDL.Rotation, PyKDL.Frame])):
-            if (type(delta_input) is PyKDL.Vector):
-                return self.__dmove_translation(delta_input, interpolate, blocking)
-            elif (type(delta_input) is PyKDL.Rotation):
-                return self.__dmove_rotation(delta_input, interpolate, blocking)
-            elif (type(delta_input) is PyKDL.Frame):
-                return self.__dmove_frame(delta_input, interpolate, blocking)
+        # find method based on input type
+        handler = self.__dmove_dispatch.get(type(delta_input))
+        if handler is None:
+            # a sequence of 3 floats is used as a translation
+            translation = self.__to_vector(delta_input)
+            if translation is None:
+                rospy.logerr('%s -> dmove, input is of type %s and is not one of: PyKDL.Vector, PyKDL.Rotation, PyKDL.Frame or a sequence of 3 floats',
+                             self.__caller_id, type(delta_input))
+                return False
+            return self.__dmove_translation(translation, interpolate, blocking)
+        return handler(delta_input, interpolate, blocking)
 
 
     def __dmove_translation(self, delta_translation, interpolate = True, blocking = True):
@@ -572,9 +818,9 @@ class arm(object):
 
         :param delta_translation: the incremental translation you want to make based on the current position, this is in terms of a  `PyKDL.Vector <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        # convert into a Frame
-        delta_rotation = PyKDL.Rotation.Identity()
-        delta_frame = PyKDL.Frame(delta_rotation, delta_translation)
+        # convert into a Frame, rotation is always identity
+        delta_frame = self.__delta_translation_frame
+        delta_frame.p = delta_translation
         return self.__dmove_frame(delta_frame, interpolate, blocking)
 
 
@@ -583,9 +829,9 @@ class arm(object):
 
         :param delta_rotation: the incremental `PyKDL.Rotation <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_ based upon the current position
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        # convert into a Frame
-        delta_vector = PyKDL.Vector(0.0, 0.0, 0.0)
-        delta_frame = PyKDL.Frame(delta_rotation, delta_vector)
+        # convert into a Frame, translation is always null
+        delta_frame = self.__delta_rotation_frame
+        delta_frame.M = delta_rotation
         return self.__dmove_frame(delta_frame, interpolate, blocking)
 
 
@@ -602,16 +848,19 @@ class arm(object):
     def move(self, abs_input, interpolate = True, blocking = True):
         """Absolute translation in cartesian space.
 
-        :param abs_input: the absolute translation you want to make
+        :param abs_input: the absolute translation you want to make, either a PyKDL Vector, Rotation, Frame or a sequence of 3 floats for a translation
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        # is this a legal translation input
-        if (self.__check_input_type(abs_input, [PyKDL.Vector, PyKDL.Rotation, PyKDL.Frame])):
-            if (type(abs_input) is PyKDL.Vector):
-                return self.__move_translation(abs_input, interpolate, blocking)
-            elif (type(abs_input) is PyKDL.Rotation):
-                return self.__move_rotation(abs_input, interpolate, blocking)
-            elif (type(abs_input) is PyKDL.Frame):
-                return self.__move_frame(abs_input, interpolate, blocking)
+        # find method based on input type
+        handler = self.__move_dispatch.get(type(abs_input))
+        if handler is None:
+            # a sequence of 3 floats is used as a translation
+            translation = self.__to_vector(abs_input)
+            if translation is None:
+                rospy.logerr('%s -> move, input is of type %s and is not one of: PyKDL.Vector, PyKDL.Rotation, PyKDL.Frame or a sequence of 3 floats',
+                             self.__caller_id, type(abs_input))
+                return False
+            return self.__move_translation(translation, interpolate, blocking)
+        return handler(abs_input, interpolate, blocking)
 
 
     def __move_translation(self, abs_translation, interpolate = True, blocking = True):
@@ -654,108 +903,251 @@ class arm(object):
         :param end_frame: the ending `PyKDL.Frame <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_
         :returns: true if you had successfully move
         :rtype: Bool"""
+        if self.__cartesian_direct_thread:
+            # copy since the caller might modify the frame, replaces
+            # previous command if not sent yet
+            self.__cartesian_direct_queue.append(PyKDL.Frame(end_frame))
+            self.__cartesian_direct_event.set()
+            return True
         # set in position cartesian mode
-        end_position = posemath.toMsg(end_frame)
+        end_position = self.__frame_to_pose(end_frame, self.__pose_direct_msg)
         # go to that position directly
         self.__set_position_cartesian_pub.publish(end_position)
         return True
 
 
+    def __cartesian_direct_loop(self):
+        """Thread used to send the latest direct cartesian command, at
+        most once per period, when `~cmd_rate` is set."""
+        period = 1.0 / self.__cmd_rate
+        next_time = time.time()
+        while not rospy.is_shutdown():
+            self.__cartesian_direct_event.wait()
+            self.__cartesian_direct_event.clear()
+            if self.__cartesian_direct_stop:
+                return
+            # wait for end of period, newer commands replace the queued one
+            delay = next_time - time.time()
+            if (delay > 0.0):
+                time.sleep(delay)
+            with self.__cartesian_direct_lock:
+                # unregister might have been called while sleeping
+                if self.__cartesian_direct_stop:
+                    return
+                try:
+                    end_frame = self.__cartesian_direct_queue.popleft()
+                except IndexError:
+                    continue
+                end_position = self.__frame_to_pose(end_frame, self.__pose_direct_msg)
+                self.__set_position_cartesian_pub.publish(end_position)
+            next_time = time.time() + period
+
+
+    def __cancel_cartesian_direct(self):
+        """Drop the direct cartesian command not sent yet when
+        `~cmd_rate` is set.  This must be called before sending any
+        other command so the thread can't switch the arm back to a
+        stale direct cartesian position.  If the thread is publishing,
+        this waits until it's done so the new command is sent last."""
+        if self.__cartesian_direct_thread:
+            with self.__cartesian_direct_lock:
+                self.__cartesian_direct_queue.clear()
+
+
     def __move_cartesian_goal(self, end_frame, blocking):
         """Move the arm to the end position by providing a goal for trajectory generator.
 
         :param end_frame: the ending `PyKDL.Frame <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_
         :returns: true if you had succesfully move
         :rtype: Bool"""
+        self.__cancel_cartesian_direct()
         # set in position cartesian mode
-        end_position= posemath.toMsg(end_frame)
+        end_position = self.__frame_to_pose(end_frame, self.__pose_goal_msg)
         # go to that position by goal
         if blocking:
             return self.__set_position_goal_cartesian_publish_and_wait(end_position)
         else:
-            self.__set_position_goal_cartesian_pub.publish(end_position)
+            self.__publish_goal(self.__set_position_goal_cartesian_pub, end_position)
         return True
 
 
+    def __frame_to_pose(self, frame, pose):
+        """Fill an existing Pose message from a frame, equivalent to
+        `posemath.toMsg` without allocating a new message.
+
+        :param frame: the `PyKDL.Frame <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_ to convert
+        :param pose: the `Pose <http://docs.ros.org/api/geometry_msgs/html/msg/Pose.html>`_ to fill
+        :returns: the pose message"""
+        position = frame.p
+        pose.position.x = position[0]
+        pose.position.y = position[1]
+        pose.position.z = position[2]
+        (pose.orientation.x, pose.orientation.y,
+         pose.orientation.z, pose.orientation.w) = frame.M.GetQuaternion()
+        return pose
+
+
     def __set_position_goal_cartesian_publish_and_wait(self, end_position):
         """Wrapper around publisher/subscriber to manage events for cartesian coordinates.
 
         :param end_position: the ending `PyKDL.Frame <http://docs.ros.org/diamondback/api/kdl/html/python/geometric_primitives.html>`_
         :returns: returns true if the goal is reached
         :rtype: Bool"""
+        self.__publish_goal(self.__set_position_goal_cartesian_pub, end_position)
+        return self.wait_for_goal()
+
+
+    def __publish_goal(self, publisher, goal):
+        """Send a goal to the trajectory generator.  The goal reached
+        flag and event are reset first so `wait_for_goal` can be used
+        after a non blocking move.
+
+        :param publisher: the publisher for the goal topic
+        :param goal: the goal message"""
         self.__goal_reached_event.clear()
         # the goal is originally not reached
         self.__goal_reached = False
-        # recursively call this function until end is reached
-        self.__set_position_goal_cartesian_pub.publish(end_position)
-        self.__goal_reached_event.wait(20) # 1 minute at most
-        if not self.__goal_reached:
+        publisher.publish(goal)
+
+
+    def wait_for_goal(self, timeout = None):
+        """Wait for the arm to reach the last goal sent with
+        `interpolate` set to `True`.  This can be used after a move
+        with `blocking` set to `False` so the program can perform other
+        tasks (e.g. send goals to other arms) while the arm moves.
+
+        :param timeout: the maximum amount of time to wait for, in seconds, `float('inf')` waits forever, uses the goal timeout if `None`
+        :returns: whether or not the goal was reached
+        :rtype: Bool"""
+        if timeout is None:
+            timeout = self.__goal_timeout
+        else:
+            timeout = _event_timeout(timeout)
+            if timeout is False:
+                rospy.logerr('%s -> timeout must be a positive number', self.__caller_id)
+                return False
+        self.__goal_reached_event.wait(timeout)
+        return self.__goal_reached
+
+
+    def set_goal_timeout(self, timeout):
+        """Set the maximum amount of time blocking moves wait for the
+        goal to be reached.  Default is 20 seconds, long trajectories
+        might need more.
+
+        :param timeout: the timeout in seconds, must be positive, `None` or `float('inf')` waits forever
+        :returns: whether or not the timeout has been set
+        :rtype: Bool"""
+        timeout = _event_timeout(timeout)
+        if timeout is False:
+            rospy.logerr('%s -> goal timeout must be a positive number', self.__caller_id)
             return False
+        self.__goal_timeout = timeout
         return True
 
 
+    def __joint_cmd_buffer(self):
+        """Get the buffer used to compute joint commands.  The buffer
+        is only allocated when the number of joints changes.  It is
+        copied in the command message so it can be re-used right after
+        the command is sent.
+
+        :returns: the buffer, size is the number of joints
+        :rtype: `numpy.ndarray`"""
+        if (self.__joint_cmd_buf.size != self.__joint_number):
+            self.__joint_cmd_buf = numpy.zeros(self.__joint_number, dtype = numpy.float64)
+        return self.__joint_cmd_buf
+
+
     def dmove_joint(self, delta_pos, interpolate = True, blocking = True):
         """Incremental move in joint space.
 
-        :param delta_pos: the incremental amount in which you want to move index by, this is in terms of a numpy array
+        :param delta_pos: the incremental amount in which you want to move index by, this is in terms of a numpy array or list of floats
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        if ((not(type(delta_pos) is numpy.ndarray))
-             or (not(delta_pos.dtype == numpy.float64))):
-            print("delta_pos must be an array of floats")
+        try:
+            delta_pos = numpy.ascontiguousarray(delta_pos, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> delta_pos must be an array of floats', self.__caller_id)
             return False
-        if (not(delta_pos.size ==  self.get_joint_number())):
-            print("delta_pos must be an array of size", self.get_joint_number())
+        if (not(delta_pos.size == self.__joint_number)):
+            rospy.logerr('%s -> delta_pos must be an array of size %d', self.__caller_id, self.__joint_number)
             return False
 
-        abs_pos = numpy.array(self.__position_joint_desired)
-        abs_pos = abs_pos+ delta_pos
+        abs_pos = self.__joint_cmd_buffer()
+        numpy.add(self.__position_joint_desired, delta_pos, out = abs_pos)
         return self.__move_joint(abs_pos, interpolate, blocking)
 
 
     def dmove_joint_one(self, delta_pos, indices, interpolate = True, blocking = True):
         """Incremental index move of 1 joint in joint space.
 
-        :param delta_pos: the incremental amount in which you want to move index by, this is a float
-        :param index: the joint you want to move, this is an integer
+        :param delta_pos: the incremental amount in which you want to move index by, this is a float (or integer)
+        :param indices: the joint you want to move, this is an integer (Python or numpy)
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        if (type(delta_pos) is float and type(indices) is int):
-            return self.dmove_joint_some(numpy.array([delta_pos]), numpy.array([indices]), interpolate, blocking)
-        else:
+        if (not(_is_joint_value(delta_pos)) or not(_is_joint_index(indices))):
+            rospy.logerr('%s -> delta_pos must be a number and indices an integer', self.__caller_id)
             return False
+        if (not(0 <= indices < self.__joint_number)):
+            rospy.logerr('%s -> index must be less than %d', self.__caller_id, self.__joint_number)
+            return False
+        abs_pos = self.__joint_cmd_buffer()
+        numpy.copyto(abs_pos, self.__position_joint_desired)
+        abs_pos[indices] += delta_pos
+        return self.__move_joint(abs_pos, interpolate, blocking)
+
+
+    def __check_joint_values_indices(self, name, values, indices):
+        """Check the values and joint indices used by the *_joint_some
+        methods.  Prints an error message if they are not valid.
+
+        :param name: the name of the values parameter, used in error messages
+        :param values: the values, this is a numpy array or list of floats
+        :param indices: the joints indices, this is a numpy array or list of integers
+        :returns: flattened values and indices, None if not valid
+        :rtype: tuple of `numpy.ndarray`"""
+        # convert values, no copy if already an array of floats
+        try:
+            values = numpy.ascontiguousarray(values, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> %s must be an array of floats', self.__caller_id, name)
+            return None
+
+        # indices must be integers, converted to numpy's index type
+        indices = numpy.asarray(indices)
+        if (not(indices.dtype.kind in 'iu')):
+            rospy.logerr('%s -> indices must be an array of integers', self.__caller_id)
+            return None
+        indices = indices.astype(numpy.intp, copy = False).ravel()
+
+        joint_number = self.__joint_number
+        if ((not(indices.size == values.size))
+            or (indices.size > joint_number)):
+            rospy.logerr('%s -> size of %s and indices must match and be less than %d', self.__caller_id, name, joint_number)
+            return None
+
+        if (numpy.any((indices < 0) | (indices >= joint_number))):
+            rospy.logerr('%s -> all indices must be less than %d', self.__caller_id, joint_number)
+            return None
+
+        return values, indices
 
 
     def dmove_joint_some(self, delta_pos, indices, interpolate = True, blocking = True):
         """Incremental index move of a series of joints in joint space.
 
-        :param delta_pos: the incremental amount in which you want to move index by, this is a numpy array corresponding to the number of indices
-        :param indices: the joints you want to move, this is a numpy array of indices
+        :param delta_pos: the incremental amount in which you want to move index by, this is a numpy array or list corresponding to the number of indices
+        :param indices: the joints you want to move, this is a numpy array or list of indices
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
 
-        # check if delta is an array
-        if ((not(type(delta_pos) is numpy.ndarray))
-             or (not(delta_pos.dtype == numpy.float64))):
-            print("delta_pos must be an array of floats")
-            return False
-
-        # check the length of the delta move
-        if ((not(type(indices) is numpy.ndarray))
-            or (not(indices.dtype == numpy.int64))):
-            print("indices must be an array of integers")
+        checked = self.__check_joint_values_indices('delta_pos', delta_pos, indices)
+        if checked is None:
             return False
+        delta_pos, indices = checked
 
-        if ((not(indices.size == delta_pos.size))
-            or (indices.size > self.get_joint_number())):
-            print("size of delta_pos and indices must match and be less than", self.get_joint_number())
-            return False
-
-        for i in range(indices.size):
-            if (indices[i] > self.get_joint_number()):
-                print("all indices must be less than", self.get_joint_number())
-                return False
-
-        abs_pos = numpy.array(self.__position_joint_desired)
-        for i in range(len(indices)):
-            abs_pos[indices[i]] = abs_pos[indices[i]] + delta_pos[i]
+        # add deltas, numpy.add.at accumulates repeated indices
+        abs_pos = self.__joint_cmd_buffer()
+        numpy.copyto(abs_pos, self.__position_joint_desired)
+        numpy.add.at(abs_pos, indices, delta_pos)
 
         # move accordingly
         return self.__move_joint(abs_pos, interpolate, blocking)
@@ -764,63 +1156,86 @@ class arm(object):
     def move_joint(self, abs_pos, interpolate = True, blocking = True):
         """Absolute move in joint space.
 
-        :param abs_pos: the absolute position in which you want to move, this is a numpy array
+        :param abs_pos: the absolute position in which you want to move, this is a numpy array or list of floats
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
 
-        if ((not(type(abs_pos) is numpy.ndarray))
-            or (not(abs_pos.dtype == numpy.float64))):
-            print("abs_pos must be an array of floats")
+        try:
+            abs_pos = numpy.ascontiguousarray(abs_pos, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> abs_pos must be an array of floats', self.__caller_id)
             return False
-        if (not(abs_pos.size == self.get_joint_number())):
-            print("abs_pos must be an array of size", self.get_joint_number())
+        if (not(abs_pos.size == self.__joint_number)):
+            rospy.logerr('%s -> abs_pos must be an array of size %d', self.__caller_id, self.__joint_number)
             return False
 
         return self.__move_joint(abs_pos, interpolate, blocking)
 
 
+    def move_joint_batch(self, abs_positions):
+        """Absolute moves through a series of positions in joint space.
+        All positions are checked before the first one is sent so the
+        arm doesn't stop half way because of an invalid position.
+        The trajectory generator is always used (see :ref:`interpolate
+        <interpolate>`) and each position has to be reached before the
+        next one is sent.
+
+        :param abs_positions: the absolute positions, this is a numpy array (or list of lists) with one row per position
+        :returns: whether or not all positions have been reached
+        :rtype: Bool"""
+        try:
+            abs_positions = numpy.ascontiguousarray(abs_positions, dtype = numpy.float64)
+        except (TypeError, ValueError):
+            rospy.logerr('%s -> abs_positions must be an array of floats', self.__caller_id)
+            return False
+        if ((abs_positions.ndim != 2)
+            or (abs_positions.shape[1] != self.__joint_number)):
+            rospy.logerr('%s -> abs_positions must be an array with %d columns',
+                         self.__caller_id, self.__joint_number)
+            return False
+        if (not(self.check_joint_limits(abs_positions))):
+            return False
+
+        # all positions have been checked, use the goal path directly
+        for abs_pos in abs_positions:
+            if not self.__move_joint_goal(abs_pos, True):
+                return False
+        return True
+
+
     def move_joint_one(self, abs_pos, joint_index, interpolate = True, blocking = True):
         """Absolute index move of 1 joint in joint space.
 
-        :param value: the absolute amount in which you want to move index by, this is a list
-        :param index: the joint you want to move, this is a list
+        :param abs_pos: the absolute position you want to move the joint to, this is a float (or integer)
+        :param joint_index: the joint you want to move, this is an integer (Python or numpy)
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
-        if ((type(abs_pos) is float) and (type(joint_index) is int)):
-            return self.move_joint_some(numpy.array([abs_pos]), numpy.array([joint_index]), interpolate, blocking)
-        else:
+        if (not(_is_joint_value(abs_pos)) or not(_is_joint_index(joint_index))):
+            rospy.logerr('%s -> abs_pos must be a number and joint_index an integer', self.__caller_id)
             return False
+        if (not(0 <= joint_index < self.__joint_number)):
+            rospy.logerr('%s -> index must be less than %d', self.__caller_id, self.__joint_number)
+            return False
+        abs_pos_result = self.__joint_cmd_buffer()
+        numpy.copyto(abs_pos_result, self.__position_joint_desired)
+        abs_pos_result[joint_index] = abs_pos
+        return self.__move_joint(abs_pos_result, interpolate, blocking)
 
 
     def move_joint_some(self, abs_pos, indices, interpolate = True, blocking = True):
         """Absolute index move of a series of joints in joint space.
 
-        :param value: the absolute amount in which you want to move index by, this is a list
-        :param index: the joint you want to move, this is a list
+        :param abs_pos: the absolute positions you want to move the joints to, this is a numpy array or list corresponding to the number of indices
+        :param indices: the joints you want to move, this is a numpy array or list of indices
         :param interpolate: see  :ref:`interpolate <interpolate>`"""
 
-        if ((not(type(abs_pos) is numpy.ndarray))
-            or (not(abs_pos.dtype == numpy.float64))):
-            print("delta_pos must be an array of floats")
-            return False
-
-        # check the length of the delta move
-        if ((not(type(indices) is numpy.ndarray))
-            or (not(indices.dtype == numpy.int64))):
-            print("indices must be an array of integers")
+        checked = self.__check_joint_values_indices('abs_pos', abs_pos, indices)
+        if checked is None:
             return False
+        abs_pos, indices = checked
 
-        if ((not(indices.size == abs_pos.size))
-            or (indices.size > self.get_joint_number())):
-            print("size of delta_pos and indices must match and be less than", self.get_joint_number())
-            return False
-
-        for i in range(indices.size):
-            if (indices[i] > self.get_joint_number()):
-                print("all indices must be less than", self.get_joint_number())
-                return False
-
-        abs_pos_result = numpy.array(self.__position_joint_desired)
-        for i in range(len(indices)):
-            abs_pos_result[indices[i]] = abs_pos[i]
+        # other joints keep their desired position
+        abs_pos_result = self.__joint_cmd_buffer()
+        numpy.copyto(abs_pos_result, self.__position_joint_desired)
+        abs_pos_result[indices] = abs_pos
 
         # move accordingly
         return self.__move_joint(abs_pos_result, interpolate, blocking)
@@ -831,6 +1246,10 @@ class arm(object):
 
         :param abs_joint: the absolute position of the joints in terms of a numpy array
         :param interpolate: if false the trajectory generator will be used; if true you can bypass the trajectory generator"""
+        # only call the limits check if limits have been set
+        if ((self.__joint_min is not None)
+            and not(self.check_joint_limits(abs_joint))):
+            return False
         if (interpolate):
             return self.__move_joint_goal(abs_joint, blocking)
         else:
@@ -842,9 +1261,10 @@ class arm(object):
         :param end_joint: the list of joints in which you should conclude movement
         :returns: true if you had succesfully move
         :rtype: Bool"""
+        self.__cancel_cartesian_direct()
         # go to that position directly
-        joint_state = JointState()
-        joint_state.position[:] = end_joint.flat
+        joint_state = self.__joint_state_direct_msg
+        joint_state.position = end_joint.tolist()
         self.__set_position_joint_pub.publish(joint_state)
         return True
 
@@ -855,12 +1275,13 @@ class arm(object):
         :param end_joint: the list of joints in which you should conclude movement
         :returns: true if you had succesfully move
         :rtype: Bool"""
-        joint_state = JointState()
-        joint_state.position[:] = end_joint.flat
+        self.__cancel_cartesian_direct()
+        joint_state = self.__joint_state_goal_msg
+        joint_state.position = end_joint.tolist()
         if blocking:
             return self.__set_position_goal_joint_publish_and_wait(joint_state)
         else:
-            self.__set_position_goal_joint_pub.publish(joint_state)
+            self.__publish_goal(self.__set_position_goal_joint_pub, joint_state)
         return True
 
 
@@ -870,25 +1291,21 @@ class arm(object):
         :param end_position: there is only one parameter, end_position which tells us what the ending position is
         :returns: whether or not you have successfully moved by goal or not
         :rtype: Bool"""
-        self.__goal_reached_event.clear()
-        self.__goal_reached = False
-        self.__set_position_goal_joint_pub.publish(end_position)
-        self.__goal_reached_event.wait(20) # 1 minute at most
-        if not self.__goal_reached:
-            return False
-        return True
+        self.__publish_goal(self.__set_position_goal_joint_pub, end_position)
+        return self.wait_for_goal()
 
 
     def set_effort_joint(self, effort):
         if ((not(type(effort) is numpy.ndarray))
             or (not(effort.dtype == numpy.float64))):
-            print("effort must be an array of floats")
+            rospy.logerr('%s -> effort must be an array of floats', self.__caller_id)
             return False
-        if (not(effort.size == self.get_joint_number())):
-            print("effort must be an array of size", self.get_joint_number())
+        if (not(effort.size == self.__joint_number)):
+            rospy.logerr('%s -> effort must be an array of size %d', self.__caller_id, self.__joint_number)
             return False
-        joint_state = JointState()
-        joint_state.effort[:] = effort.flat
+        self.__cancel_cartesian_direct()
+        joint_state = self.__effort_joint_msg
+        joint_state.effort = effort.ravel().tolist()
         self.__set_effort_joint_pub.publish(joint_state)
         return True
 
@@ -898,13 +1315,10 @@ class arm(object):
 
         :param force: the new force to set it to
         """
-        w = Wrench()
-        w.force.x = force[0]
-        w.force.y = force[1]
-        w.force.z = force[2]
-        w.torque.x = 0.0
-        w.torque.y = 0.0
-        w.torque.z = 0.0
+        self.__cancel_cartesian_direct()
+        w = self.__wrench_msg
+        f = w.force
+        f.x, f.y, f.z = float(force[0]), float(force[1]), float(force[2])
         self.__set_wrench_spatial_pub.publish(w)
 
 
@@ -917,13 +1331,10 @@ class arm(object):
 
     def set_wrench_body_force(self, force):
         "Apply a wrench with force only (body), torque is null"
-        w = Wrench()
-        w.force.x = force[0]
-        w.force.y = force[1]
-        w.force.z = force[2]
-        w.torque.x = 0.0
-        w.torque.y = 0.0
-        w.torque.z = 0.0
+        self.__cancel_cartesian_direct()
+        w = self.__wrench_msg
+        f = w.force
+        f.x, f.y, f.z = float(force[0]), float(force[1]), float(force[2])
         self.__set_wrench_body_pub.publish(w)
 
 
@@ -935,6 +1346,11 @@ class arm(object):
 
 # Unregister all publishers and subscribers for this instance
     def unregister(self, verbose=False):
+        if self.__cartesian_direct_thread:
+            # stop the thread before the publishers are unregistered
+            self.__cartesian_direct_stop = True
+            self.__cancel_cartesian_direct()
+            self.__cartesian_direct_event.set()
         for sub in self.__sub_list:
             sub.unregister()
         if verbose:
@@ -61,7 +61,7 @@ class console(object):
         if not rospy.get_node_uri():
             rospy.init_node('console_api', anonymous = True, log_level = rospy.WARN)
         else:
-            rospy.logdebug(rospy.get_caller_id() + ' -> ROS already initialized')
+            rospy.logdebug('%s -> ROS already initialized', rospy.get_caller_id())
 
 
     def __teleop_scale_cb(self, data):
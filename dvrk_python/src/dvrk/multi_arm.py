@@ -0,0 +1,168 @@
+#  Created on: 2026-10
+
+#   (C) Copyright 2026 Johns Hopkins University (JHU), All Rights Reserved.
+
+# --- begin cisst license - do not edit ---
+
+# This software is provided "as is" under an open source license, with
+# no warranty.  The complete license can be found in license.txt and
+# http://www.cisst.org/cisst/license.txt.
+
+# --- end cisst license ---
+
+import numpy
+import rospy
+
+from dvrk.arm import _read_only_view
+
+class multi_arm(object):
+    """Group of arms controlled in joint space as a single arm.  The
+    joint positions of all arms are concatenated in a single array,
+    in the order the arms are provided.  For example with a `PSM1`
+    (7 joints) and a `PSM2`, joints 0 to 6 are `PSM1` and joints 7 to
+    13 are `PSM2`.
+
+    Goals are sent to all arms first and then the group waits for all
+    arms to reach their goals so the arms move together."""
+
+    # initialize the group
+    def __init__(self, arms):
+        """Constructor.
+
+        :param arms: the arms in the group, a list of `arm` (or derived classes)"""
+        self.__arms = tuple(arms)
+        self.__joint_numbers = ()
+        self.__slices = ()
+        self.__joint_number = 0
+        self.__position_joint_desired = numpy.zeros(0, dtype = numpy.float64)
+        self.__position_joint_current = numpy.zeros(0, dtype = numpy.float64)
+        self.__position_joint_desired_view = _read_only_view(self.__position_joint_desired)
+        self.__position_joint_current_view = _read_only_view(self.__position_joint_current)
+        self.__update_slices()
+
+
+    def __update_slices(self):
+        """Compute the joint range of each arm in the concatenated
+        arrays.  This is only done when the number of joints of one of
+        the arms changes, i.e. when the first joint state is received."""
+        joint_numbers = tuple(a.get_joint_number() for a in self.__arms)
+        if (joint_numbers == self.__joint_numbers):
+            return
+        offsets = numpy.cumsum((0,) + joint_numbers).tolist()
+        self.__joint_numbers = joint_numbers
+        self.__slices = tuple(slice(start, stop)
+                              for start, stop in zip(offsets[:-1], offsets[1:]))
+        self.__joint_number = offsets[-1]
+        self.__position_joint_desired = numpy.zeros(self.__joint_number, dtype = numpy.float64)
+        self.__position_joint_current = numpy.zeros(self.__joint_number, dtype = numpy.float64)
+        self.__position_joint_desired_view = _read_only_view(self.__position_joint_desired)
+        self.__position_joint_current_view = _read_only_view(self.__position_joint_current)
+
+
+    def arms(self):
+        """Get the arms in the group.
+
+        :returns: the arms
+        :rtype: tuple"""
+        return self.__arms
+
+
+    def get_joint_number(self):
+        """Get the total number of joints for all arms in the group.
+
+        :returns: the number of joints
+        :rtype: int"""
+        self.__update_slices()
+        return self.__joint_number
+
+
+    def get_desired_joint_position(self):
+        """Get the desired joint positions of all arms.
+
+        :returns: the desired positions, read-only, concatenated in the arms order
+        :rtype: `numpy.ndarray`"""
+        self.__update_slices()
+        for a, s in zip(self.__arms, self.__slices):
+            self.__position_joint_desired[s] = a.get_desired_joint_position()
+        return self.__position_joint_desired_view
+
+
+    def get_current_joint_position(self):
+        """Get the current joint positions of all arms.
+
+        :returns: the current positions, read-only, concatenated in the arms order
+        :rtype: `numpy.ndarray`"""
+        self.__update_slices()
+        for a, s in zip(self.__arms, self.__slices):
+            self.__position_joint_current[s] = a.get_current_joint_position()
+        return self.__position_joint_current_view
+
+
+    def dmove_joint(self, delta_pos, interpolate = True, blocking = True):
+        """Incremental move in joint space for all arms.
+
+        :param delta_pos: the incremental amount for all joints, this is a numpy array or list of floats
+        :param interpolate: see  :ref:`interpolate <interpolate>`
+        :returns: whether or not all arms have moved
+        :rtype: Bool"""
+        try:
+            delta_pos = numpy.asarray(delta_pos, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('multi_arm -> delta_pos must be an array of floats')
+            return False
+        desired = self.get_desired_joint_position()
+        if (not(delta_pos.size == desired.size)):
+            rospy.logerr('multi_arm -> delta_pos must be an array of size %d', desired.size)
+            return False
+        return self.__move_joint(desired + delta_pos, interpolate, blocking)
+
+
+    def move_joint(self, abs_pos, interpolate = True, blocking = True):
+        """Absolute move in joint space for all arms.
+
+        :param abs_pos: the absolute position for all joints, this is a numpy array or list of floats
+        :param interpolate: see  :ref:`interpolate <interpolate>`
+        :returns: whether or not all arms have moved
+        :rtype: Bool"""
+        try:
+            abs_pos = numpy.ascontiguousarray(abs_pos, dtype = numpy.float64).ravel()
+        except (TypeError, ValueError):
+            rospy.logerr('multi_arm -> abs_pos must be an array of floats')
+            return False
+        if (not(abs_pos.size == self.get_joint_number())):
+            rospy.logerr('multi_arm -> abs_pos must be an array of size %d', self.__joint_number)
+            return False
+        return self.__move_joint(abs_pos, interpolate, blocking)
+
+
+    def __move_joint(self, abs_pos, interpolate, blocking):
+        """Check the slices of all arms, send them, then wait for all
+        goals if needed.  No arm moves if one slice is not valid.
+
+        :param abs_pos: the absolute position for all joints, size has been checked
+        :param interpolate: see  :ref:`interpolate <interpolate>`"""
+        # slices of a contiguous array are contiguous, no copy per arm
+        for a, s in zip(self.__arms, self.__slices):
+            abs_joint = abs_pos[s]
+            if (not(abs_joint.size == a.get_joint_number())):
+                rospy.logerr('multi_arm -> number of joints changed for %s', a.name())
+                return False
+            if (not(a.check_joint_limits(abs_joint))):
+                return False
+        for a, s in zip(self.__arms, self.__slices):
+            if not a.move_joint(abs_pos[s], interpolate, False):
+                return False
+        if (interpolate and blocking):
+            return self.wait_for_goal()
+        return True
+
+
+    def wait_for_goal(self, timeout = None):
+        """Wait for all arms to reach their last goal, see `arm.wait_for_goal`.
+
+        :param timeout: the maximum amount of time to wait for each arm, in seconds, uses each arm goal timeout if `None`
+        :returns: whether or not all goals were reached
+        :rtype: Bool"""
+        # wait for all arms, even if one of them failed
+        reached = [a.wait_for_goal(timeout) for a in self.__arms]
+        return all(reached)
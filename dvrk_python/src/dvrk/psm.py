@@ -31,13 +31,13 @@ class psm(arm):
         # publishers
         self.__set_position_jaw_pub = rospy.Publisher(self._arm__full_ros_namespace
                                                       + '/set_position_jaw',
-                                                      JointState, latch = True, queue_size = 1)
+                                                      JointState, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_position_goal_jaw_pub = rospy.Publisher(self._arm__full_ros_namespace
                                                            + '/set_position_goal_jaw',
                                                            JointState, latch = True, queue_size = 1)
         self.__set_effort_jaw_pub = rospy.Publisher(self._arm__full_ros_namespace
                                                     + '/set_effort_jaw',
-                                                    JointState, latch = True, queue_size = 1)
+                                                    JointState, latch = False, queue_size = 1, tcp_nodelay = True)
         self.__set_tool_present_pub = rospy.Publisher(self._arm__full_ros_namespace
                                                       + '/set_tool_present',
                                                       Bool, latch = True, queue_size = 1)
@@ -104,14 +104,9 @@ class psm(arm):
         joint_state.position.append(angle_radian)
         # check for interpolation
         if interpolate:
+            self._arm__publish_goal(self.__set_position_goal_jaw_pub, joint_state)
             if blocking:
-                self._arm__goal_reached_event.clear()
-                self._arm__goal_reached = False
-            self.__set_position_goal_jaw_pub.publish(joint_state)
-            if blocking:
-                self._arm__goal_reached_event.wait(20)
-                if not self._arm__goal_reached:
-                    return False
+                return self.wait_for_goal()
             return True
         else:
             return self.__set_position_jaw_pub.publish(joint_state)
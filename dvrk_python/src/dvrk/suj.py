@@ -35,7 +35,8 @@ class suj(object):
         self.__ros_namespace = ros_namespace
 
         # continuous publish from dvrk_bridge
-        self.__position_joint_current = numpy.array(0, dtype = numpy.float)
+        # joint array is allocated when the first message is received
+        self.__position_joint_current = numpy.zeros(0, dtype = numpy.float64)
         self.__position_cartesian_current = PyKDL.Frame()
         self.__position_cartesian_local_current = PyKDL.Frame()
 
@@ -57,14 +58,16 @@ class suj(object):
         if not rospy.get_node_uri():
             rospy.init_node('suj_api', anonymous = True, log_level = rospy.WARN)
         else:
-            rospy.logdebug(rospy.get_caller_id() + ' -> ROS already initialized')
+            rospy.logdebug('%s -> ROS already initialized', rospy.get_caller_id())
 
     def __state_joint_current_cb(self, data):
         """Callback for the current joint position.
 
         :param data: the `JointState <http://docs.ros.org/api/sensor_msgs/html/msg/JointState.html>`_current"""
-        self.__position_joint_current.resize(len(data.position))
-        self.__position_joint_current.flat[:] = data.position
+        # only allocate if the number of joints changed
+        if self.__position_joint_current.size != len(data.position):
+            self.__position_joint_current = numpy.zeros(len(data.position), dtype = numpy.float64)
+        numpy.copyto(self.__position_joint_current, data.position)
 
     def __position_cartesian_current_cb(self, data):
         """Callback for the current cartesian position.
@@ -92,7 +95,7 @@ class suj(object):
         :param end_joint: the list of joints in which you should conclude movement
         # go to that position directly"""
         joint_state = JointState()
-        joint_state.position[:] = end_joint.flat
+        joint_state.position = end_joint.ravel().tolist()
         self.__set_position_joint_pub.publish(joint_state)
 
     def get_current_position(self):
@@ -56,7 +56,7 @@ class teleop_psm(object):
         if not rospy.get_node_uri():
             rospy.init_node('teleop_api', anonymous = True, log_level = rospy.WARN)
         else:
-            rospy.logdebug(rospy.get_caller_id() + ' -> ROS already initialized')
+            rospy.logdebug('%s -> ROS already initialized', rospy.get_caller_id())
 
 
     def __scale_cb(self, data):